@@ -145,8 +145,10 @@ class Block(Object):
 
         args, kwargs = tf.nest.map_structure(self._convert_to_tensor,
                                              [args, kwargs])
-        with tf.init_scope(): # pylint: disable=not-context-manager
-            if not self._built:
+        # The init scope is only entered if the block needs to be built,
+        # to avoid the overhead of the context manager for all other calls
+        if not self._built:
+            with tf.init_scope(): # pylint: disable=not-context-manager
                 shapes =  tf.nest.map_structure(self._get_shape,
                                              [args, kwargs])
                 self.build(*shapes[0], **shapes[1])
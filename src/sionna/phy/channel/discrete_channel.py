@@ -5,7 +5,6 @@
 
 import tensorflow as tf
 from sionna.phy import config, Block
-from sionna.phy.utils import expand_to_rank
 
 class BinaryMemorylessChannel(Block):
     # pylint: disable=line-too-long
@@ -133,37 +132,47 @@ class BinaryMemorylessChannel(Block):
 
     def _check_inputs(self, x):
         """Check input x for consistency, i.e., verify
-        that all values are binary of bipolar values."""
-        x = tf.cast(x, self.rdtype)
-        if self._check_input:
-            if self._bipolar_input: # allow -1 and 1 for bipolar inputs
-                values = (tf.constant(-1, x.dtype),tf.constant(1, x.dtype))
-            else: # allow 0,1 for binary input
-                values = (tf.constant(0, x.dtype),tf.constant(1, x.dtype))
-            tf.debugging.assert_equal(
-                tf.reduce_min(tf.cast(tf.logical_or(tf.equal(x, values[0]),
-                                    tf.equal(x, values[1])), x.dtype)),
-                tf.constant(1, x.dtype),
-                "Input must be binary.")
+        that all values are binary of bipolar values.
+
+        The check requires a full reduction over x and is hence only
+        executed once in eager mode, i.e., it is not added to graphs."""
+        if self._check_input and tf.executing_eagerly():
+            # boolean inputs are binary by definition
+            if x.dtype!=tf.bool:
+                x = tf.cast(x, self.rdtype)
+                if self._bipolar_input: # allow -1 and 1 for bipolar inputs
+                    d = x * x - 1
+                else: # allow 0,1 for binary input
+                    d = x * (x - 1)
+                # d is zero iff x takes one of the two allowed values
+                tf.debugging.assert_equal(tf.reduce_max(tf.abs(d)),
+                                          tf.constant(0, x.dtype),
+                                          "Input must be binary.")
             # input datatype consistency should be only evaluated once
             self._check_input = False
 
     def _check_dtype(self, x, allow_uint=True):
+        """Check that the dtype of x is supported.
+
+        The check only depends on the static dtype and is hence done in
+        Python, so that no assertion ops are created in the graph."""
         if self._return_llrs:
-            tf.debugging.assert_equal(x.dtype in (tf.float32, tf.float64), True,
-                                "LLR outputs require non-integer dtypes.")
+            valid = x.dtype in (tf.float32, tf.float64)
+            msg = "LLR outputs require non-integer dtypes."
+        elif self._bipolar_input:
+            valid = x.dtype in (tf.float32, tf.float64,
+                                tf.int8, tf.int16, tf.int32, tf.int64)
+            msg = "Only signed dtypes are supported for bipolar inputs."
         else:
-            if self._bipolar_input:
-                tf.debugging.assert_equal(x.dtype in (tf.float32, tf.float64, tf.int8, tf.int16, tf.int32, tf.int64), True,
-                                   "Only signed dtypes are supported for bipolar inputs.")
-            else:
-                tf.debugging.assert_equal(x.dtype in (tf.float32, tf.float64,
-                                                tf.uint8, tf.uint16, tf.uint32, tf.uint64,
-                                                tf.int8, tf.int16, tf.int32, tf.int64), True,
-                                    "Only real-valued dtypes are supported.")
-            if not allow_uint:
-                tf.debugging.assert_equal(x.dtype in (tf.uint8, tf.uint16, tf.uint32, tf.uint64,), False,
-                                          "Only signed dtypes supported.")
+            valid = x.dtype in (tf.float32, tf.float64,
+                                tf.uint8, tf.uint16, tf.uint32, tf.uint64,
+                                tf.int8, tf.int16, tf.int32, tf.int64)
+            msg = "Only real-valued dtypes are supported."
+        if valid and not allow_uint:
+            valid = x.dtype not in (tf.uint8, tf.uint16, tf.uint32, tf.uint64)
+            msg = "Only signed dtypes supported."
+        if not valid:
+            raise tf.errors.InvalidArgumentError(None, None, msg)
 
     @tf.custom_gradient
     def _custom_xor(self, a, b):
@@ -171,55 +180,64 @@ class BinaryMemorylessChannel(Block):
         def grad(upstream):
             """identity in backward direction"""
             return upstream, upstream
-        if a.dtype in (tf.uint8, tf.uint16, tf.uint32, tf.uint64, tf.int8, tf.int16, tf.int32, tf.int64):
-            z = tf.math.mod(a+b, tf.constant(2, a.dtype))
+        if a.dtype.is_integer: # native XOR for integer dtypes
+            z = tf.bitwise.bitwise_xor(a, b)
         else: # use abs for float dtypes
             z = tf.abs(a - b)
 
         return z, grad
 
-    @tf.custom_gradient
-    def _ste_binarizer(self, x):
-        """Straight through binarizer to quantize bits to int values."""
-        def grad(upstream):
-            """identity in backward direction"""
-            return upstream
-        # hard-decide in forward path
-        z = tf.where(x<.5, 0., 1.)
-        return z, grad
-
     def _sample_errors(self, pb, shape):
-        """Samples binary error vector with given error probability e.
-        This function is based on the Gumble-softmax "trick" to keep the
-        sampling differentiable."""
+        """Samples binary error vector with given error probability pb.
+        The sampling is based on the Gumble-softmax "trick" to keep it
+        differentiable."""
 
         # this implementation follows https://arxiv.org/pdf/1611.01144v5.pdf
         # and https://arxiv.org/pdf/1906.07748.pdf
 
-        u1 = config.tf_rng.uniform(shape=shape,
-                                          minval=0.,
-                                          maxval=1.,
-                                          dtype=pb.dtype)
-        u2 = config.tf_rng.uniform(shape=shape,
-                                   minval=0.,
-                                   maxval=1.,
-                                   dtype=pb.dtype)
-        u = tf.stack((u1, u2), axis=-1)
-
-        # sample Gumble distribution
-        eps = tf.cast(self._eps, pb.dtype)
-        temp = tf.cast(self._temperature, pb.dtype)
-        q = - tf.math.log(- tf.math.log(u + eps) + eps)
-        p = tf.stack((pb,1-pb), axis=-1)
-        p = expand_to_rank(p, tf.rank(q), axis=0)
-        p = tf.broadcast_to(p, tf.shape(q))
-        a = (tf.math.log(p + eps) + q) / temp
-
-        # apply softmax
-        e_cat = tf.nn.softmax(a)
-
-        # binarize final values via straight-through estimator
-        return self._ste_binarizer(e_cat[...,0]) # only take first class
+        u = config.tf_rng.uniform(shape=shape,
+                                  minval=0.,
+                                  maxval=1.,
+                                  dtype=pb.dtype)
+        return self._gumbel_max_ste(pb, u)
+
+    @tf.custom_gradient
+    def _gumbel_max_ste(self, pb, u):
+        """Hard Gumble-max decision with Gumble-softmax straight-through
+        gradient.
+
+        For two classes, the difference of the two Gumble samples follows
+        a logistic distribution. Thus, the hard decision of the Gumble-max
+        trick reduces to comparing a single uniform sample ``u`` against
+        ``pb``, i.e., the forward pass draws exact Bernoulli samples.
+        The relaxed Gumble-softmax sample is only evaluated to compute the
+        gradient w.r.t. ``pb`` for the same noise realization.
+        """
+        def grad(upstream):
+            """Gradient of the Gumble-softmax relaxation w.r.t. pb"""
+            eps = tf.cast(self._eps, pb.dtype)
+            temp = tf.cast(self._temperature, pb.dtype)
+            # pb is clipped to [0,1] with zero gradient outside of the range
+            valid = tf.cast(tf.logical_and(pb>=0, pb<=1), pb.dtype)
+            pb_ = tf.clip_by_value(pb, 0., 1.)
+            # The logits log(pb)-log(1-pb) and the logistic noise
+            # log(1-u)-log(u), which is consistent with the hard decision
+            # u<pb, are evaluated with a single logarithm
+            z = tf.math.log(((pb_ + eps) * (1 - u + eps))
+                            / ((1 - pb_ + eps) * (u + eps)))
+            s = tf.sigmoid(z / temp)
+            ds = s * (1 - s) / temp * (1 / (pb_ + eps) + 1 / (1 - pb_ + eps))
+            ds *= valid
+            # sum over all dimensions to which pb was broadcast
+            axes, _ = tf.raw_ops.BroadcastGradientArgs(s0=tf.shape(pb),
+                                                       s1=tf.shape(u))
+            grad_pb = tf.reshape(tf.reduce_sum(upstream * ds, axes),
+                                 tf.shape(pb))
+            return grad_pb, None
+
+        # hard-decide in forward path
+        e = tf.cast(u < pb, pb.dtype)
+        return e, grad
 
     def build(self, *input_shapes):
         """Verify correct input shapes"""
@@ -249,25 +267,30 @@ class BinaryMemorylessChannel(Block):
             pb0 = pb[...,0]
             pb1 = pb[...,1]
 
-        # clip for numerical stability
+        return self._apply_channel(x, pb0, pb1)
+
+    def _apply_channel(self, x, pb0, pb1):
+        """Apply the channel with error probabilities pb0 and pb1 given as
+        separate tensors, i.e., without stacking them in the last dimension.
+        """
+
+        # no clipping required as the hard decision u<pb saturates for
+        # pb outside of [0,1]
         pb0 = tf.cast(pb0, self.rdtype) # Gumble requires float dtypes
         pb1 = tf.cast(pb1, self.rdtype) # Gumble requires float dtypes
-        pb0 = tf.clip_by_value(pb0, 0., 1.)
-        pb1 = tf.clip_by_value(pb1, 0., 1.)
 
         # check x for consistency (binary, bipolar)
         self._check_inputs(x)
 
-        e0 = self._sample_errors(pb0, tf.shape(x))
-        e1 = self._sample_errors(pb1, tf.shape(x))
-
         if self._bipolar_input:
             neutral_element = tf.constant(-1, dtype=x.dtype)
         else:
             neutral_element = tf.constant(0, dtype=x.dtype)
 
-        # mask e0 and e1 with input such that e0 only applies where x==0
-        e = tf.where(x==neutral_element, e0, e1)
+        # select error probability per position such that pb0 only applies
+        # where x==0, and sample a single error vector
+        pb = tf.where(x==neutral_element, pb0, pb1)
+        e = self._sample_errors(pb, tf.shape(x))
         e = tf.cast(e, x.dtype)
 
         if self._bipolar_input:
@@ -282,11 +305,14 @@ class BinaryMemorylessChannel(Block):
             if not self._bipolar_input:
                 y = 2 * y - 1 # transform to bipolar
 
+            # clip for numerical stability; log1p(-pb) evaluates to -inf
+            # for pb=1, which is handled by the final llr clipping
+            pb0 = tf.clip_by_value(pb0, self._eps, 1.)
+            pb1 = tf.clip_by_value(pb1, self._eps, 1.)
+
             # Remark: Sionna uses the logit definition log[p(x=1)/p(x=0)]
-            y0 = - (tf.math.log(pb1 + self._eps)
-                   - tf.math.log(1 - pb0 - self._eps))
-            y1 = (tf.math.log(1 - pb1 - self._eps)
-                  - tf.math.log(pb0 + self._eps))
+            y0 = - (tf.math.log(pb1) - tf.math.log1p(-pb0))
+            y1 = tf.math.log1p(-pb1) - tf.math.log(pb0)
             # multiply by y to keep gradient
             y = tf.cast(tf.where(y==1, y1, y0), dtype=y.dtype) * y
             # and clip output llrs
@@ -377,10 +403,11 @@ class BinarySymmetricChannel(BinaryMemorylessChannel):
         """Apply discrete binary symmetric channel, i.e., randomly flip
         bits with probability pb."""
 
+        # Check input dtype for consistency with parameters
+        self._check_dtype(x)
+
         # the BSC is implemented by calling the DMC with symmetric pb
-        pb = tf.cast(pb, x.dtype)
-        pb = tf.stack((pb, pb), axis=-1)
-        y = super().call(x, pb)
+        y = self._apply_channel(x, pb, pb)
 
         return y
 
@@ -470,10 +497,11 @@ class BinaryZChannel(BinaryMemorylessChannel):
     def call(self, x, pb):
         """Apply discrete binary symmetric channel, i.e., randomly flip
         bits with probability pb."""
+        # Check input dtype for consistency with parameters
+        self._check_dtype(x)
+
         # the Z is implemented by calling the DMC with p(1|0)=0
-        pb = tf.cast(pb, x.dtype)
-        pb = tf.stack((tf.zeros_like(pb), pb), axis=-1)
-        y = super().call(x, pb)
+        y = self._apply_channel(x, 0., pb)
 
         return y
 
@@ -566,15 +594,16 @@ class BinaryErasureChannel(BinaryMemorylessChannel):
         # Check input dtype for consistency with parameters
         self._check_dtype(x, allow_uint=False)
 
-        # clip for numerical stability
-        pb = tf.cast(pb, tf.float32) # Gumble requires float dtypes
-        pb = tf.clip_by_value(pb, 0., 1.)
+        pb = tf.cast(pb, self.rdtype)
 
         # check x for consistency (binary, bipolar)
         self._check_inputs(x)
 
         # sample erasure pattern
-        e = self._sample_errors(pb, tf.shape(x))
+        # the pattern is only used as mask, i.e., no gradient w.r.t. pb is
+        # required and a plain Bernoulli draw is sufficient
+        e = config.tf_rng.uniform(tf.shape(x), minval=0., maxval=1.,
+                                  dtype=pb.dtype) < pb
 
         # if LLRs should be returned
         # remark: the Sionna logit definition is llr = log[p(x=1)/p(x=0)]
@@ -584,7 +613,7 @@ class BinaryErasureChannel(BinaryMemorylessChannel):
             x *= tf.cast(self._llr_max, x.dtype) # calculate llrs
 
             # erase positions by setting llrs to 0
-            y = tf.where(e==1, tf.constant(0, x.dtype), x)
+            y = tf.where(e, tf.constant(0, x.dtype), x)
         else: # ternary outputs
             # the erasure indicator depends on the operation mode
             if self._bipolar_input:
@@ -592,5 +621,5 @@ class BinaryErasureChannel(BinaryMemorylessChannel):
             else:
                 erased_element = tf.constant(-1, dtype=x.dtype)
 
-            y = tf.where(e==0, x, erased_element)
+            y = tf.where(e, erased_element, x)
         return y
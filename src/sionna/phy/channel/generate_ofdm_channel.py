@@ -3,6 +3,7 @@
 # SPDX-License-Identifier: Apache-2.0#
 """Class for generating channel frequency responses"""
 
+import tensorflow as tf
 from sionna.phy.block import Object
 from sionna.phy.channel.utils import subcarrier_frequencies, cir_to_ofdm_channel
 
@@ -68,9 +69,15 @@ class GenerateOFDMChannel(Object):
         self._sampling_frequency = 1./resource_grid.ofdm_symbol_duration
 
         # Frequencies of the subcarriers
-        self._frequencies = subcarrier_frequencies(self._num_subcarriers,
-                                                   self._subcarrier_spacing,
-                                                   self.precision)
+        # They are created as an eager constant, even if this object is
+        # instantiated within a traced function, so that they are captured
+        # as a constant by all graphs using this object.
+        with tf.init_scope(): # pylint: disable=not-context-manager
+            frequencies = subcarrier_frequencies(self._num_subcarriers,
+                                                 self._subcarrier_spacing,
+                                                 self.precision)
+            self._frequencies = tf.constant(frequencies.numpy(),
+                                            dtype=self.rdtype)
 
     def __call__(self, batch_size=None):
 
@@ -220,25 +220,26 @@ def cir_to_ofdm_channel(frequencies,
         #  - number of rx antennas (2)
         #  - number of tx antennas (4)
         tau = tf.expand_dims(tf.expand_dims(tau, axis=2), axis=4)
-        # Broadcast is not supported yet by TF for such high rank tensors.
-        # We therefore do part of it manually
-        tau = tf.tile(tau, [1, 1, 1, 1, a.shape[4], 1])
-
-    # Add a time samples dimension for broadcasting
-    tau = tf.expand_dims(tau, axis=6)
 
-    # Bring all tensors to broadcastable shapes
+    # Add a frequency dimension for broadcasting
+    # [batch size, num_rx, 1 or num_rx_ant, num_tx, 1 or num_tx_ant,
+    #  num_paths, 1]
     tau = tf.expand_dims(tau, axis=-1)
-    h = tf.expand_dims(a, axis=-1)
-    frequencies = expand_to_rank(frequencies, tf.rank(tau), axis=0)
 
     # Compute the Fourier transforms of all cluster taps
     # Exponential component
+    # [batch size, num_rx, 1 or num_rx_ant, num_tx, 1 or num_tx_ant,
+    #  num_paths, fft_size]
     e = tf.exp(tf.complex(tf.constant(0, real_dtype),
                           -2*PI*frequencies*tau))
-    h_f = h*e
+
     # Sum over all clusters to get the channel frequency responses
-    h_f = tf.reduce_sum(h_f, axis=-3)
+    # This is computed as a batched matrix product over the paths, which
+    # avoids materializing the per-path responses for all time steps
+    # and subcarriers. The batch dimensions of `e` are broadcast.
+    # [batch size, num_rx, num_rx_ant, num_tx, num_tx_ant, num_time_steps,
+    #  fft_size]
+    h_f = tf.linalg.matmul(a, e, transpose_a=True)
 
     if normalize:
         # Normalization is performed such that for each batch example and
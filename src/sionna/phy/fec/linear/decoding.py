@@ -228,11 +228,16 @@ class OSDecoder(Block):
             t error indices.
         """
 
-        err_patterns = []
-        for p in itertools.combinations(range(n), t):
-            err_patterns.append(p)
-
-        return tf.constant(err_patterns)
+        # Flatten all combinations into a single int32 array without
+        # materializing the list of tuples
+        num_patterns = self._num_error_patterns(n, t)
+        err_patterns = np.fromiter(
+                        itertools.chain.from_iterable(
+                                    itertools.combinations(range(n), t)),
+                        dtype=np.int32,
+                        count=num_patterns*t)
+
+        return tf.constant(np.reshape(err_patterns, [num_patterns, t]))
 
     def _get_dist(self, llr, c_hat):
         """Distance function used for ML candidate selection.
@@ -10,6 +10,28 @@ from scipy.special import comb
 from importlib_resources import files, as_file
 from . import codes # pylint: disable=relative-beyond-top-level
 
+# channel ranking of the 5G Polar code; loaded on first use
+_CH_ORDER_5G = None
+
+def _load_5g_ranking():
+    """Returns the channel ranking of Tab. 5.3.1.2-1 in [3GPPTS38212]_
+    sorted by the channel index (2nd column).
+
+    The table is parsed only once and cached, as it is constant.
+    """
+    global _CH_ORDER_5G # pylint: disable=global-statement
+    if _CH_ORDER_5G is None:
+        # load the channel ranking from csv format in folder "codes"
+        source = files(codes).joinpath("polar_5G.csv")
+        with as_file(source) as csv:
+            ch_order = np.genfromtxt(csv, delimiter=";")
+        ch_order = ch_order.astype(int)
+        # sort according to the channel index (2nd row)
+        ch_order = ch_order[np.argsort(ch_order[:,1]),:]
+        ch_order.setflags(write=False)
+        _CH_ORDER_5G = ch_order
+    return _CH_ORDER_5G
+
 def generate_5g_ranking(k, n, sort=True):
     """Returns information and frozen bit positions of the 5G Polar code
     as defined in Tab. 5.3.1.2-1 in [3GPPTS38212]_ for given values of ``k``
@@ -79,15 +101,8 @@ def generate_5g_ranking(k, n, sort=True):
     if np.log2(n)!=int(np.log2(n)):
         raise ValueError("n must be a power of 2.")
 
-    # load the channel ranking from csv format in folder "codes"
-    source = files(codes).joinpath("polar_5G.csv")
-    with as_file(source) as codes.csv:
-        ch_order = np.genfromtxt(codes.csv, delimiter=";")
-    ch_order = ch_order.astype(int)
-
-    # find n smallest values of channel order (2nd row)
-    ind = np.argsort(ch_order[:,1])
-    ch_order_sort = ch_order[ind,:]
+    # channel ranking sorted by the channel index (2nd row)
+    ch_order_sort = _load_5g_ranking()
     # only consider the first n channels
     ch_order_sort_n = ch_order_sort[0:n,:]
     # and sort again according to reliability
@@ -96,20 +111,16 @@ def generate_5g_ranking(k, n, sort=True):
 
     # and calculate frozen/information positions for given n, k
     # assume that pre_frozen_pos are already frozen (rate-matching)
-    frozen_pos = np.zeros(n-k)
-    info_pos = np.zeros(k)
     #the n-k smallest positions of ch_order denote frozen pos.
-    for i in range(n-k):
-        frozen_pos[i] = ch_order_n[i,1] # 2. row yields index to freeze
-    for i in range(n-k, n):
-        info_pos[i-(n-k)] = ch_order_n[i,1] # 2. row yields index to freeze
+    frozen_pos = ch_order_n[:n-k,1] # 2. row yields index to freeze
+    info_pos = ch_order_n[n-k:,1]
 
     # sort to have channels in ascending order
     if sort:
         info_pos = np.sort(info_pos)
         frozen_pos = np.sort(frozen_pos)
 
-    return [frozen_pos.astype(int), info_pos.astype(int)]
+    return [frozen_pos, info_pos]
 
 def generate_polar_transform_mat(n_lift):
     """Generate the polar transformation matrix (Kronecker product).
@@ -134,15 +145,12 @@ def generate_polar_transform_mat(n_lift):
         msg = "Warning: the resulting code length is large (=2^n_lift)."
         raise ValueError(msg)
 
-    gm = np.array([[1, 0],[ 1, 1]])
+    gm = np.array([[1., 0.],[ 1., 1.]])
 
+    # lift the kernel by repeated Kronecker products
     gm_l = np.copy(gm)
     for _ in range(n_lift-1):
-        gm_l_new = np.zeros([2*np.shape(gm_l)[0],2*np.shape(gm_l)[1]])
-        for j in range(np.shape(gm_l)[0]):
-            for k in range(np.shape(gm_l)[1]):
-                gm_l_new[2*j:2*j+2, 2*k:2*k+2] = gm_l[j,k]*gm
-        gm_l = gm_l_new
+        gm_l = np.kron(gm_l, gm)
     return gm_l
 
 def generate_rm_code(r, m):
@@ -196,11 +204,11 @@ def generate_rm_code(r, m):
 
     # select positions to freeze
     # freeze all rows that have weight < m-r
-    w = np.zeros(n)
-    for i in range(n):
-        x_bin = np.binary_repr(i)
-        for x_i in x_bin:
-            w[i] += int(x_i)
+    # the row weight equals the Hamming weight of the binary row index
+    idx = np.arange(n)
+    w = np.zeros(n, dtype=int)
+    for b in range(m):
+        w += (idx >> b) & 1
     frozen_vec = w < m-r
     info_vec = np.invert(frozen_vec)
     k_res = np.sum(info_vec)
@@ -264,15 +272,26 @@ def generate_dense_polar(frozen_pos, n, verbose=True):
 
     k = n - len(frozen_pos)
 
-    # generate info positions
-    info_pos = np.setdiff1d(np.arange(n), frozen_pos)
+    if np.any(frozen_pos<0) or np.any(frozen_pos>=n):
+        raise ValueError("frozen_pos must be in range [0, n-1].")
+
+    # generate (sorted) info positions
+    info_mask = np.ones(n, bool)
+    info_mask[frozen_pos] = False
+    info_pos = np.nonzero(info_mask)[0]
     if k!=len(info_pos):
         raise ArithmeticError("Internal error: invalid info_pos generated.")
 
-    gm_mat = generate_polar_transform_mat(int(np.log2(n)))
-
-    gm_true = gm_mat[info_pos,:]
-    pcm = np.transpose(gm_mat[:,frozen_pos])
+    # the polar transform has a one at position (i,j) iff j is a binary
+    # submask of i, i.e., the required rows and columns can be directly
+    # evaluated without generating the full transform
+    ind = np.arange(n)
+    # rows of the info positions
+    gm_true = np.bitwise_and(ind[None,:], np.invert(info_pos[:,None]))==0
+    gm_true = gm_true.astype(float)
+    # (transposed) columns of the frozen positions
+    pcm = np.bitwise_and(frozen_pos[:,None], np.invert(ind[None,:]))==0
+    pcm = pcm.astype(float)
 
     if verbose:
         print("Shape of the generator matrix: ", gm_true.shape)
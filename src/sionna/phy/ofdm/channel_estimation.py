@@ -276,11 +276,10 @@ class LSChannelEstimator(BaseChannelEstimator):
         # Expand rank of no for broadcasting
         no = expand_to_rank(no, tf.rank(h_ls), -1)
 
-        # Expand rank of pilots for broadcasting
-        pilots = expand_to_rank(self._pilot_pattern.pilots, tf.rank(h_ls), 0)
-
         # Compute error variance, broadcastable to the shape of h_ls
-        err_var = tf.math.divide_no_nan(no, tf.abs(pilots)**2)
+        # As for h_ls, broadcasting from pilots is automatic
+        err_var = tf.math.divide_no_nan(no,
+                                        tf.abs(self._pilot_pattern.pilots)**2)
 
         return h_ls, err_var
 
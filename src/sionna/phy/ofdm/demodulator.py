@@ -5,11 +5,8 @@
 
 import numpy as np
 import tensorflow as tf
-from tensorflow.signal import fftshift
 
-from sionna.phy import Block, PI
-from sionna.phy.utils import expand_to_rank
-from sionna.phy.signal import fft
+from sionna.phy import Block
 
 class OFDMDemodulator(Block):
     # pylint: disable=line-too-long
@@ -73,9 +70,11 @@ class OFDMDemodulator(Block):
 
     Input
     -----
-    :[...,num_ofdm_symbols*(fft_size+cyclic_prefix_length)+n] or [...,num_ofdm_symbols*fft_size+sum(cyclic_prefix_length)+n], `tf.complex`
+    :[...,num_ofdm_symbols*(fft_size+cyclic_prefix_length)+n] or [...,num_ofdm_symbols*fft_size+sum(cyclic_prefix_length)+n], `tf.complex` | `tf.float`
         Tensor containing the time-domain signal along the last dimension.
-        `n` is a nonnegative integer.
+        `n` is a nonnegative integer. For real-valued signals, only the
+        non-negative frequencies are computed by the FFT and the remaining
+        subcarriers are obtained from the Hermitian symmetry of the spectrum.
 
     Output
     ------
@@ -89,6 +88,7 @@ class OFDMDemodulator(Block):
         self._fft_size = None
         self._l_min = None
         self._cyclic_prefix_length = None
+        self._uniform_cp_length = None
         self.fft_size = fft_size
         self.l_min = l_min
         self.cyclic_prefix_length = cyclic_prefix_length
@@ -117,87 +117,167 @@ class OFDMDemodulator(Block):
 
     @cyclic_prefix_length.setter
     def cyclic_prefix_length(self, value):
-        value = tf.cast(value, tf.int32)
-        if not tf.reduce_all(value>=0):
+        # Checks are done in NumPy to avoid dispatching TensorFlow ops
+        value = np.asarray(value, dtype=np.int32)
+        if not np.all(value>=0):
             msg = "`cyclic_prefix_length` must be nonnegative."
             raise ValueError(msg)
-        if not 0<= tf.rank(value)<=1:
+        if not value.ndim<=1:
             msg = "`cyclic_prefix_length` must be of rank 0 or 1"
             raise ValueError(msg)
-        self._cyclic_prefix_length = value
+        self._cyclic_prefix_length = tf.constant(value)
+
+        # Identical CP lengths for all OFDM symbols allow for removing the
+        # cyclic prefix by reshaping and slicing instead of gathering
+        if value.ndim==0:
+            self._uniform_cp_length = int(value)
+        elif value.size>0 and np.all(value==value[0]):
+            self._uniform_cp_length = int(value[0])
+        else:
+            self._uniform_cp_length = None
 
     def build(self, input_shape): # pylint: disable=unused-argument
         # Compute phase correction terms to to channel
-        tmp = -2 * PI * tf.cast(self.l_min, tf.float32) \
-              / tf.cast(self.fft_size, tf.float32) \
-              * tf.range(self.fft_size, dtype=tf.float32)
-        self._phase_compensation = tf.exp(tf.complex(0., tmp))
-
-        if len(self.cyclic_prefix_length.shape)==0:
-            # Compute number of elements that will be truncated
-            self._rest = np.mod(input_shape[-1],
-                                    self.fft_size + self.cyclic_prefix_length)
-
-            # Compute number of full OFDM symbols to be demodulated
-            self._num_ofdm_symbols = np.floor_divide(
-                                    input_shape[-1]-self._rest,
-                                    self.fft_size + self.cyclic_prefix_length)
+        # All terms are computed once in NumPy and directly stored in the
+        # block's complex dtype so that no cast is required when calling
+        # the block. Phases are reduced modulo 2pi prior to evaluating
+        # the complex exponential.
+        # [fft_size]
+        n = np.arange(self.fft_size)
+        tmp = -2*np.pi*np.mod(self.l_min*n, self.fft_size)/self.fft_size
+        rot = np.exp(1j*tmp)
+
+        # The DC subcarrier is shifted to the middle by modulating the
+        # time-domain signal prior to the FFT, as a cyclic shift of the
+        # spectrum by s=fft_size//2 corresponds to a multiplication of
+        # the n-th time-domain sample by exp(j2pi*n*s/fft_size).
+        # The phase compensation terms are hence also stored in
+        # shifted order, so that no explicit fftshift is required.
+        # The normalization of the DFT by 1/sqrt(fft_size) is also
+        # included, so that it does not need to be computed for every call.
+        # [fft_size]
+        phase_compensation = np.fft.fftshift(rot)/np.sqrt(self.fft_size)
+        tmp = 2*np.pi*np.mod(n*(self.fft_size//2), self.fft_size)/self.fft_size
+        shift_modulation = np.exp(1j*tmp)
+
+        self._phase_compensation = tf.cast(phase_compensation, self.cdtype)
+        self._apply_phase_compensation = self.l_min!=0
+        if not self._apply_phase_compensation:
+            # Without timing offset, only the normalization needs to be
+            # applied. It is merged with the modulation terms, so that no
+            # multiplication is required after the FFT.
+            shift_modulation /= np.sqrt(self.fft_size)
+        self._shift_modulation = tf.cast(shift_modulation, self.cdtype)
+
+        # For real-valued inputs, the spectrum is obtained from the RFFT,
+        # i.e., the bins 0,...,fft_size//2, and their complex conjugates,
+        # exploiting the Hermitian symmetry X[k]=conj(X[fft_size-k]).
+        # These indices gather the shifted spectrum from the concatenation
+        # of the RFFT output and its complex conjugate.
+        # [fft_size]
+        k = np.mod(n - self.fft_size//2, self.fft_size)
+        num_bins = self.fft_size//2 + 1
+        self._rfft_ind = tf.constant(np.where(k<num_bins, k,
+                                              num_bins+self.fft_size-k),
+                                     tf.int32)
+
+        if self._uniform_cp_length is not None:
+            # All quantities are Python integers, so that the slicing and
+            # reshaping in call() results in static shapes
+            self._symbol_length = self.fft_size + self._uniform_cp_length
+            if len(self.cyclic_prefix_length.shape)==0:
+                # Compute number of full OFDM symbols to be demodulated
+                self._num_ofdm_symbols = int(input_shape[-1]) \
+                                         // self._symbol_length
+            else:
+                self._num_ofdm_symbols = int(
+                                        self.cyclic_prefix_length.shape[0])
+
+            # Compute number of samples that are kept. All trailing samples
+            # that do not fit into an OFDM symbol are discarded.
+            self._num_samples = self._num_ofdm_symbols*self._symbol_length
         else:
             # Deal with individual cp lengths for OFDM symbols
             # Compute the relevant indices to gather for
             # every OFDM symbol from the time domain input
-            num_ofdm_symbols = self.cyclic_prefix_length.shape[0]
-            row_lengths = self.cyclic_prefix_length + self.fft_size
-            offsets = tf.math.cumsum(tf.concat([[0], row_lengths],
-                                               axis=0)[:-1])
-            offsets = tf.expand_dims(offsets, 1)
-            ind = tf.repeat(tf.range(start=0,
-                                     limit=self.fft_size)[tf.newaxis,:],
-                            repeats=num_ofdm_symbols, axis=0)
-            ind += self.cyclic_prefix_length[:, tf.newaxis]
-            ind += offsets
+            cp_length = self.cyclic_prefix_length.numpy()
+            self._num_ofdm_symbols = cp_length.shape[0]
+            row_lengths = cp_length + self.fft_size
+            offsets = np.cumsum(row_lengths) - row_lengths
             # [num_ofdm_symbols, fft_size]
-            self._ind = ind
+            ind = np.arange(self.fft_size)[np.newaxis] \
+                  + (cp_length + offsets)[:, np.newaxis]
+
+            # Flatten indices to gather along a single dimension
+            # The indices are strictly increasing, so that consecutive
+            # samples of the input are read.
+            # [num_ofdm_symbols*fft_size]
+            self._ind = tf.constant(np.reshape(ind, [-1]), tf.int32)
 
     def call(self, inputs):
         """Demodulate OFDM waveform onto a resource grid
 
         Args:
-            inputs (`tf.complex`):
+            inputs (`tf.complex` | `tf.float`):
                 `[...,num_ofdm_symbols*(fft_size+cyclic_prefix_length)]`.
 
         Returns:
             `tf.complex` : The demodulated inputs of shape
             `[...,num_ofdm_symbols, fft_size]`.
         """
-        if len(self.cyclic_prefix_length.shape)==0:
+        if self._uniform_cp_length is not None:
             # Same CP length for all OFDM symbols
             # Cut last samples that do not fit into an OFDM symbol
-            inputs = inputs if self._rest==0 else inputs[...,:-self._rest]
+            inputs = inputs[...,:self._num_samples]
 
             # Reshape input to separate OFDM symbols
             new_shape = tf.concat(
                             [tf.shape(inputs)[:-1],
-                            [self._num_ofdm_symbols],
-                            [self.fft_size + self.cyclic_prefix_length]], 0)
+                            [self._num_ofdm_symbols, self._symbol_length]], 0)
             x = tf.reshape(inputs, new_shape)
 
             # Remove cyclic prefix
-            x = x[...,self.cyclic_prefix_length:]
+            x = x[...,self._uniform_cp_length:]
 
         else:
             # Individual CP length for OFDM symbols
             x = tf.gather(inputs, self._ind, axis=-1)
 
-        # Compute FFT
-        x = fft(x)
+            # Reshape output to separate OFDM symbols
+            new_shape = tf.concat(
+                            [tf.shape(inputs)[:-1],
+                            [self._num_ofdm_symbols, self.fft_size]], 0)
+            x = tf.reshape(x, new_shape)
+
+        # Collapse all leading dimensions into a single batch dimension,
+        # so that the FFTs of all OFDM symbols are computed as one batch
+        # of contiguous fft_size-point transforms
+        x_shape = tf.shape(x)
+        if x.dtype.is_complex:
+            x = tf.reshape(x * self._shift_modulation, [-1, self.fft_size])
+
+            # Compute FFT with the DC subcarrier shifted to the middle
+            x = tf.signal.fft(x)
+            x = tf.reshape(x, x_shape)
+
+            # Apply normalization and phase shift compensation to all
+            # subcarriers
+            if self._apply_phase_compensation:
+                x = x * self._phase_compensation
+        else:
+            x = tf.reshape(x, [-1, self.fft_size])
+
+            # Compute only the non-negative frequencies of the real-valued
+            # signal and recover the full spectrum from its symmetry
+            x = tf.signal.rfft(x)
+            x = tf.concat([x, tf.math.conj(x)], axis=-1)
 
-        # Apply phase shift compensation to all subcarriers
-        rot = tf.cast(self._phase_compensation, x.dtype)
-        rot = expand_to_rank(rot, tf.rank(x), 0)
-        x = x * rot
+            # Shift DC subcarrier to the middle
+            x = tf.gather(x, self._rfft_ind, axis=-1)
+            x = tf.reshape(x, x_shape)
 
-        # Shift DC subcarrier to the middle
-        x = fftshift(x, axes=-1)
+            # Apply normalization and phase shift compensation to all
+            # subcarriers
+            x = x * self._phase_compensation
 
         return x
@@ -3,12 +3,11 @@
 # SPDX-License-Identifier: Apache-2.0#
 """Class definition for the OFDM Modulator"""
 
+import numpy as np
 import tensorflow as tf
-from tensorflow.signal import ifftshift
 
 from sionna.phy import Block
 from sionna.phy.utils import flatten_last_dims
-from sionna.phy.signal import ifft
 
 
 class OFDMModulator(Block):
@@ -53,17 +52,31 @@ class OFDMModulator(Block):
 
     @cyclic_prefix_length.setter
     def cyclic_prefix_length(self, value):
-        value = tf.cast(value, tf.int32)
-        if not tf.reduce_all(value>=0):
+        # Checks are done in NumPy to avoid dispatching TensorFlow ops
+        value = np.asarray(value, dtype=np.int32)
+        if not np.all(value>=0):
             msg = "`cyclic_prefix_length` must be nonnegative."
             raise ValueError(msg)
-        if not 0<= tf.rank(value)<=1:
+        if not value.ndim<=1:
             msg = "`cyclic_prefix_length` must be of rank 0 or 1"
             raise ValueError(msg)
-        self._cyclic_prefix_length = value
+        self._cyclic_prefix_length = tf.constant(value)
 
     def build(self, input_shape):
         num_ofdm_symbols, fft_size = input_shape[-2:]
+
+        # The DC subcarrier is shifted to the first position by modulating
+        # the time-domain signal after the IFFT, as a cyclic shift of the
+        # spectrum by -s, s=fft_size//2, corresponds to a multiplication of
+        # the n-th time-domain sample by exp(-j2pi*n*s/fft_size).
+        # The normalization of the IDFT by sqrt(fft_size) is also included,
+        # so that it does not need to be computed for every call.
+        # [fft_size]
+        n = np.arange(fft_size)
+        tmp = -2*np.pi*np.mod(n*(fft_size//2), fft_size)/fft_size
+        self._shift_modulation = tf.cast(np.sqrt(fft_size)*np.exp(1j*tmp),
+                                         self.cdtype)
+
         if not tf.reduce_all(self.cyclic_prefix_length<=fft_size):
             msg = "`cyclic_prefix_length` cannot be larger than `fft_size`."
             raise ValueError(msg)
@@ -96,11 +109,9 @@ class OFDMModulator(Block):
 
     def call(self, inputs):
 
-        # Shift DC subcarrier to first position
-        x_freq = ifftshift(inputs, axes=-1)
-
-        # Compute IFFT along the last dimension
-        x_time = ifft(x_freq)
+        # Compute IFFT along the last dimension with the DC subcarrier
+        # shifted to the first position
+        x_time = tf.signal.ifft(inputs) * self._shift_modulation
 
         if len(self.cyclic_prefix_length.shape)==1:
             # Individual CP length per OFDM symbol
@@ -76,14 +76,14 @@ class PilotPattern(Object):
         """
         `int` : Number of pilot symbols per transmit stream
         """
-        return tf.shape(self._pilots)[-1]
+        return self._pilots.shape[-1]
 
     @property
     def num_data_symbols(self):
         """
         `int` : Number of data symbols per transmit stream
         """
-        return tf.shape(self._mask)[-1]*tf.shape(self._mask)[-2] - \
+        return self._mask.shape[-1]*self._mask.shape[-2] - \
                self.num_pilot_symbols
 
     @property
@@ -95,7 +95,8 @@ class PilotPattern(Object):
 
     @normalize.setter
     def normalize(self, value):
-        self._normalize = tf.cast(value, tf.bool)
+        self._normalize = bool(value)
+        self._normalized_pilots = None
 
     @property
     def mask(self):
@@ -114,13 +115,20 @@ class PilotPattern(Object):
             for pilots have been set. If this is not the desired behavior,
             turn normalization off.
         """
-        def norm_pilots():
-            scale = tf.abs(self._pilots)**2
-            scale = 1/tf.sqrt(tf.reduce_mean(scale, axis=-1, keepdims=True))
-            scale = tf.cast(scale, self.cdtype)
-            return scale*self._pilots
+        if not self._normalize:
+            return self._pilots
 
-        return tf.cond(self.normalize, norm_pilots, lambda: self._pilots)
+        # Trainable or symbolic pilots must be normalized on every access
+        if isinstance(self._pilots, tf.Variable) or \
+           tf.is_symbolic_tensor(self._pilots):
+            return self._normalize_pilots()
+
+        # Otherwise, the normalized pilots are computed only once and
+        # outside of any graph, so that they can be reused across graphs
+        if self._normalized_pilots is None:
+            with tf.init_scope(): # pylint: disable=not-context-manager
+                self._normalized_pilots = self._normalize_pilots()
+        return self._normalized_pilots
 
     @pilots.setter
     def pilots(self, v):
@@ -128,21 +136,34 @@ class PilotPattern(Object):
         # Ensure that pilots are always complex valued
         if isinstance(self._pilots, tf.Tensor):
             self._pilots = tf.cast(self._pilots, self.cdtype)
+        self._normalized_pilots = None
+
+    def _normalize_pilots(self):
+        """Normalize pilots to an average energy of one across the last
+        dimension"""
+        # Squared magnitude without evaluating the square root of tf.abs
+        energy = tf.square(tf.math.real(self._pilots)) \
+                 + tf.square(tf.math.imag(self._pilots))
+        scale = tf.math.rsqrt(tf.reduce_mean(energy, axis=-1, keepdims=True))
+        return tf.cast(scale, self._pilots.dtype)*self._pilots
 
     def _check_settings(self):
         """Validate that all properties define a valid pilot pattern."""
 
-        assert tf.rank(self._mask)==4, "`mask` must have four dimensions."
-        assert tf.rank(self._pilots)==3, "`pilots` must have three dimensions."
+        # All checks are based on static shapes and values, i.e., no
+        # TensorFlow ops are required
+        assert len(self._mask.shape)==4, "`mask` must have four dimensions."
+        assert len(self._pilots.shape)==3, \
+            "`pilots` must have three dimensions."
         assert np.array_equal(self._mask.shape[:2], self._pilots.shape[:2]), \
             "The first two dimensions of `mask` and `pilots` must be equal."
 
-        num_pilots = tf.reduce_sum(self._mask, axis=(-2,-1))
-        assert tf.reduce_min(num_pilots)==tf.reduce_max(num_pilots), \
+        num_pilots = np.sum(self._mask.numpy(), axis=(-2,-1))
+        assert np.min(num_pilots)==np.max(num_pilots), \
             """The number of nonzero elements in the masks for all transmitters
             and streams must be identical."""
 
-        assert self.num_pilot_symbols==tf.reduce_max(num_pilots), \
+        assert self._pilots.shape[-1]==np.max(num_pilots), \
             """The shape of the last dimension of `pilots` must equal
             the number of non-zero entries within the last two
             dimensions of `mask`."""
@@ -204,13 +225,10 @@ class PilotPattern(Object):
                 cbar.set_ticklabels(legend)
 
                 if show_pilot_ind:
-                    c = 0
-                    for t in range(self.num_ofdm_symbols):
-                        for k in range(self.num_effective_subcarriers):
-                            if mask[i,j][t,k]:
-                                if np.abs(pilots[i,j,c])>0:
-                                    plt.annotate(c, [t, k])
-                                c+=1
+                    # Pilots are mapped in row-major order onto the mask
+                    ts, ks = np.nonzero(mask[i,j])
+                    for c in np.nonzero(np.abs(pilots[i,j])>0)[0]:
+                        plt.annotate(c, [ts[c], ks[c]])
                 figs.append(fig)
 
         return figs
@@ -351,25 +369,25 @@ class KroneckerPilotPattern(PilotPattern):
         # Number of pilots per OFDM symbol
         num_pilots_per_symbol = int(num_pilots/num_pilot_symbols)
 
-        # Prepare empty mask and pilots
+        # Prepare empty mask
         shape = [num_tx, num_streams_per_tx,
                  num_ofdm_symbols,num_effective_subcarriers]
         mask = np.zeros(shape, bool)
-        shape[2] = num_pilot_symbols
-        pilots = np.zeros(shape, np.complex64)
 
         # Populate all selected OFDM symbols in the mask
         mask[..., pilot_ofdm_symbol_indices, :] = True
 
-        # Populate the pilots with random QPSK symbols
+        # Generate random QPSK symbols for all transmitters and streams
         qam_source = QAMSource(2, seed=seed)
-        for i in range(num_tx):
-            for j in range(num_streams_per_tx):
-                # Generate random QPSK symbols
-                p = qam_source([1,1,num_pilot_symbols,num_pilots_per_symbol])
-
-                # Place pilots spaced by num_seq to avoid overlap
-                pilots[i,j,:,i*num_streams_per_tx+j::num_seq] = p
+        p = qam_source([num_tx, num_streams_per_tx, num_pilot_symbols,
+                        num_pilots_per_symbol]).numpy()
+
+        # Place pilots spaced by num_seq to avoid overlap, i.e., the pilots
+        # of the stream with index i*num_streams_per_tx+j are placed on every
+        # num_seq-th subcarrier starting from this index
+        one_hot = np.reshape(np.eye(num_seq, dtype=np.complex64),
+                             [num_tx, num_streams_per_tx, 1, 1, num_seq])
+        pilots = np.expand_dims(p, -1)*one_hot
 
         # Reshape the pilots tensor
         pilots = np.reshape(pilots, [num_tx, num_streams_per_tx, -1])
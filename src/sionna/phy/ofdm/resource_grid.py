@@ -9,7 +9,7 @@ import matplotlib.pyplot as plt
 from matplotlib import colors
 from .pilot_pattern import PilotPattern, EmptyPilotPattern, \
                            KroneckerPilotPattern
-from sionna.phy.utils import flatten_last_dims, flatten_dims, split_dim
+from sionna.phy.utils import flatten_last_dims, flatten_dims
 from sionna.phy.block import Object, Block
 
 class ResourceGrid(Object):
@@ -80,6 +80,10 @@ class ResourceGrid(Object):
         self._num_guard_carriers = np.array(num_guard_carriers)
         self._dc_null = dc_null
         self._pilot_ofdm_symbol_indices = pilot_ofdm_symbol_indices
+        self._num_effective_subcarriers = int(fft_size - dc_null
+                                              - np.sum(num_guard_carriers))
+        self._dc_ind = int(fft_size/2 - (fft_size%2==1)/2)
+        self._effective_subcarrier_ind = None
         self.pilot_pattern = pilot_pattern
         self._check_settings()
 
@@ -123,28 +127,33 @@ class ResourceGrid(Object):
         """
         `int` : Number of subcarriers used for data and pilot transmissions
         """
-        n = self._fft_size - self._dc_null - np.sum(self._num_guard_carriers)
-        return n
+        return self._num_effective_subcarriers
 
     @property
     def effective_subcarrier_ind(self):
         """
         `int` : Iindices of the effective subcarriers
         """
-        num_gc = self._num_guard_carriers
-        sc_ind = range(num_gc[0], self.fft_size-num_gc[1])
-        if self.dc_null:
-            sc_ind = np.delete(sc_ind, self.dc_ind-num_gc[0])
-        return sc_ind
+        # The indices only depend on static properties and are hence
+        # computed only once
+        if self._effective_subcarrier_ind is None:
+            num_gc = self._num_guard_carriers
+            sc_ind = np.arange(num_gc[0], self.fft_size-num_gc[1],
+                               dtype=np.int32)
+            if self.dc_null:
+                sc_ind = sc_ind[sc_ind!=self.dc_ind]
+            sc_ind.setflags(write=False)
+            self._effective_subcarrier_ind = sc_ind
+        return self._effective_subcarrier_ind
 
     @property
     def num_data_symbols(self):
         """
         `int` : Number of resource elements used for data transmissions
         """
-        n = self.num_effective_subcarriers * self._num_ofdm_symbols - \
+        n = self._num_effective_subcarriers * self._num_ofdm_symbols - \
                self.num_pilot_symbols
-        return tf.cast(n, tf.int32)
+        return n
 
     @property
     def num_pilot_symbols(self):
@@ -158,9 +167,9 @@ class ResourceGrid(Object):
         """
         `int` : Number of empty resource elements
         """
-        n = (self._fft_size-self.num_effective_subcarriers) * \
+        n = (self._fft_size-self._num_effective_subcarriers) * \
                self._num_ofdm_symbols
-        return tf.cast(n, tf.int32)
+        return n
 
     @property
     def num_guard_carriers(self):
@@ -176,7 +185,7 @@ class ResourceGrid(Object):
             If ``fft_size`` is odd, the index is (``fft_size``-1)/2.
             If ``fft_size`` is even, the index is ``fft_size``/2.
         """
-        return int(self._fft_size/2 - (self._fft_size%2==1)/2)
+        return self._dc_ind
 
     @property
     def fft_size(self):
@@ -257,6 +266,8 @@ class ResourceGrid(Object):
         else:
             raise ValueError("Unsupported pilot_pattern")
         self._pilot_pattern = value
+        # The type grid depends on the pilot pattern
+        self._rg_type = None
 
     def _check_settings(self):
         """Validate that all properties define a valid resource grid"""
@@ -297,18 +308,28 @@ class ResourceGrid(Object):
             the resource elements of the corresponding resource grid.
             The type can be one of [0,1,2,3] as explained above.
         """
+        # The type grid is static and hence only computed once (outside of
+        # any graph) for every pilot pattern
+        if self._rg_type is None:
+            with tf.init_scope(): # pylint: disable=not-context-manager
+                self._rg_type = self._build_type_grid()
+        return self._rg_type
+
+    def _build_type_grid(self):
+        """Computes the output of :meth:`build_type_grid`"""
+        # The grid is static and hence assembled in NumPy
         shape = [self._num_tx, self._num_streams_per_tx, self._num_ofdm_symbols]
-        gc_l = 2*tf.ones(shape+[self._num_guard_carriers[0]], tf.int32)
-        gc_r = 2*tf.ones(shape+[self._num_guard_carriers[1]], tf.int32)
-        dc   = 3*tf.ones(shape + [tf.cast(self._dc_null, tf.int32)], tf.int32)
-        mask = self.pilot_pattern.mask
+        gc_l = np.full(shape+[self._num_guard_carriers[0]], 2, np.int32)
+        gc_r = np.full(shape+[self._num_guard_carriers[1]], 2, np.int32)
+        dc   = np.full(shape+[int(self._dc_null)], 3, np.int32)
+        mask = np.asarray(self.pilot_pattern.mask, np.int32)
         split_ind = self.dc_ind-self._num_guard_carriers[0]
-        rg_type = tf.concat([gc_l,                 # Left Guards
-                             mask[...,:split_ind], # Data & pilots
-                             dc,                   # DC
-                             mask[...,split_ind:], # Data & pilots
-                             gc_r], -1)            # Right guards
-        return rg_type
+        rg_type = np.concatenate([gc_l,                 # Left Guards
+                                  mask[...,:split_ind], # Data & pilots
+                                  dc,                   # DC
+                                  mask[...,split_ind:], # Data & pilots
+                                  gc_r], -1)            # Right guards
+        return tf.constant(rg_type, tf.int32)
 
     def show(self, tx_ind=0, tx_stream_ind=0):
         """Visualizes the resource grid for a specific transmitter and stream
@@ -383,31 +404,38 @@ class ResourceGridMapper(Block):
         super().__init__(precision=precision, **kwargs)
         self._resource_grid = resource_grid
 
-        # Precompute a tensor of shape
-        # [num_tx, num_streams_per_tx, num_ofdm_symbols, fft_size]
-        # which is prefilled with pilots and stores indices
-        # to scatter data symbols.
+        # Precompute for every resource element of the flattened resource grid
+        # of shape [num_tx, num_streams_per_tx, num_ofdm_symbols, fft_size]
+        # its index in the concatenation of data symbols, pilots, and a
+        # single null (for guard carriers and the DC carrier).
         self._rg_type = self._resource_grid.build_type_grid()
-        self._pilot_ind = tf.where(self._rg_type==1)
-        self._data_ind = tf.where(self._rg_type==0)
+        rg_type = np.reshape(self._rg_type.numpy(), [-1])
+        data_ind = np.flatnonzero(rg_type==0)
+        pilot_ind = np.flatnonzero(rg_type==1)
+        num_data, num_pilots = len(data_ind), len(pilot_ind)
+        rg_ind = np.full(rg_type.shape, num_data+num_pilots, np.int32)
+        rg_ind[data_ind] = np.arange(num_data)
+        rg_ind[pilot_ind] = num_data + np.arange(num_pilots)
+        self._rg_ind = tf.constant(rg_ind, tf.int32)
 
     def call(self, inputs):
-        # Map pilots on empty resource grid
+        batch_size = tf.shape(inputs)[0]
+
+        # Flatten the inputs
+        # [batch_size, num_tx*num_streams_per_tx*num_data_symbols]
+        inputs = flatten_last_dims(inputs, 3)
+
+        # Broadcast the pilots to batch_size
         pilots = flatten_last_dims(self._resource_grid.pilot_pattern.pilots, 3)
-        template = tf.scatter_nd(self._pilot_ind,
-                                 pilots,
-                                 self._rg_type.shape)
-        template = tf.expand_dims(template, -1)
+        pilots = tf.broadcast_to(pilots, [batch_size, tf.shape(pilots)[0]])
 
-        # Broadcast the resource grid template to batch_size
-        batch_size = tf.shape(inputs)[0]
-        new_shape = tf.concat([tf.shape(template)[:-1], [batch_size]], 0)
-        template = tf.broadcast_to(template, new_shape)
+        nulls = tf.zeros([batch_size, 1], inputs.dtype)
 
-        # Flatten the inputs and put batch_dim last for scatter update
-        inputs = tf.transpose(flatten_last_dims(inputs, 3))
-        rg = tf.tensor_scatter_nd_update(template, self._data_ind, inputs)
-        rg = tf.transpose(rg, [4, 0, 1, 2, 3])
+        # Gather data symbols, pilots, and nulls into the flattened
+        # resource grid, keeping the batch dimension first
+        rg = tf.concat([inputs, pilots, nulls], axis=-1)
+        rg = tf.gather(rg, self._rg_ind, axis=-1)
+        rg = tf.reshape(rg, [-1] + self._rg_type.shape.as_list())
 
         return rg
 
@@ -458,10 +486,19 @@ class ResourceGridDemapper(Block):
         self._resource_grid = resource_grid
 
         # Precompute indices to extract data symbols
-        mask = resource_grid.pilot_pattern.mask
+        # in the order in which they were mapped onto the resource grid
+        mask = np.asarray(resource_grid.pilot_pattern.mask)
+        mask = np.reshape(mask, list(mask.shape[:-2]) + [-1])
         num_data_symbols = resource_grid.pilot_pattern.num_data_symbols
-        data_ind = tf.argsort(flatten_last_dims(mask), direction="ASCENDING")
-        self._data_ind = data_ind[...,:num_data_symbols]
+        data_ind = np.argsort(mask, axis=-1, kind="stable")
+        data_ind = data_ind[...,:num_data_symbols]
+
+        # Map the indices to positions within the full resource grid, i.e.,
+        # including the nulled subcarriers (guards, dc)
+        sc_ind = np.asarray(resource_grid.effective_subcarrier_ind)
+        ofdm_symbol, sc = np.divmod(data_ind, len(sc_ind))
+        data_ind = ofdm_symbol*resource_grid.fft_size + sc_ind[sc]
+        self._data_ind = data_ind.astype(np.int32)
 
     def call(self, y): # pylint: disable=arguments-renamed
 
@@ -473,45 +510,25 @@ class ResourceGridDemapper(Block):
         if len(y.shape)==5:
             y = tf.expand_dims(y, -1)
 
-        # Remove nulled subcarriers from y (guards, dc). New shape:
-        # [batch_size, num_rx, num_rx_ant, ...
-        #  ..., num_ofdm_symbols, num_effective_subcarriers, data dim]
-        y = tf.gather(y, self._resource_grid.effective_subcarrier_ind, axis=-2)
-
-        # Transpose tensor to shape
-        # [num_rx, num_streams_per_rx, num_ofdm_symbols,...
-        #  ..., num_effective_subcarriers, data_dim, batch_size]
-        y = tf.transpose(y, [1, 2, 3, 4, 5, 0])
-
-        # Merge num_rx amd num_streams_per_rx
-        # [num_rx * num_streams_per_rx, num_ofdm_symbols,...
-        #  ...,num_effective_subcarriers, data_dim, batch_size]
-        y = flatten_dims(y, 2, 0)
-
-        # Put first dimension into the right ordering
-        stream_ind = self._stream_management.stream_ind
-        y = tf.gather(y, stream_ind, axis=0)
-
-        # Reshape first dimensions to [num_tx, num_streams] so that
-        # we can compared to the way the streams were created.
-        # [num_tx, num_streams, num_ofdm_symbols, num_effective_subcarriers,...
-        #  ..., data_dim, batch_size]
+        # Flatten all but the batch and data dimensions
+        # [batch_size, num_rx*num_streams_per_rx*num_ofdm_symbols*fft_size,...
+        #  ..., data_dim]
+        y = flatten_dims(y, 4, 1)
+
+        # Compose the stream ordering with the indices of the data symbols
+        # of every stream so that a single gather suffices
+        # [num_tx, num_streams, num_data_symbols]
         num_streams = self._stream_management.num_streams_per_tx
         num_tx = self._stream_management.num_tx
-        y = split_dim(y, [num_tx, num_streams], 0)
-
-        # Flatten resource grid dimensions
-        # [num_tx, num_streams, num_ofdm_symbols*num_effective_subcarriers,...
-        #  ..., data_dim, batch_size]
-        y = flatten_dims(y, 2, 2)
+        num_re = self._resource_grid.num_ofdm_symbols \
+                 * self._resource_grid.fft_size
+        stream_ind = np.reshape(self._stream_management.stream_ind,
+                                [num_tx, num_streams, 1])
+        ind = stream_ind*num_re + self._data_ind
 
         # Gather data symbols
-        # [num_tx, num_streams, num_data_symbols, data_dim, batch_size]
-        y = tf.gather(y, self._data_ind, batch_dims=2, axis=2)
-
-        # Put batch_dim first
-        # [batch_size, num_tx, num_streams, num_data_symbols]
-        y = tf.transpose(y, [4, 0, 1, 2, 3])
+        # [batch_size, num_tx, num_streams, num_data_symbols, data_dim]
+        y = tf.gather(y, ind, axis=1)
 
         # Squeeze data_dim
         if y.shape[-1]==1:
@@ -548,5 +565,15 @@ class RemoveNulledSubcarriers(Block):
         self._sc_ind = resource_grid.effective_subcarrier_ind
         super().__init__(precision=precision, **kwargs)
 
+        # Without DC null, the effective subcarriers are contiguous and
+        # can be extracted by slicing
+        sc_ind = np.asarray(self._sc_ind)
+        if np.all(np.diff(sc_ind)==1):
+            self._sc_slice = slice(int(sc_ind[0]), int(sc_ind[-1])+1)
+        else:
+            self._sc_slice = None
+
     def call(self, inputs):
+        if self._sc_slice is not None:
+            return inputs[..., self._sc_slice]
         return tf.gather(inputs, self._sc_ind, axis=-1)
@@ -37,6 +37,20 @@ def expand_to_rank(tensor, target_rank, axis=-1):
         index specified by ``axis``.
         If ``target_rank`` <= rank(``tensor``), ``tensor`` is returned.
     """
+    # If both ranks are statically known, the new axes are inserted with
+    # static shapes, i.e., without creating dynamic shape ops in the graph
+    tensor = tf.convert_to_tensor(tensor)
+    rank = tensor.shape.rank
+    static_target_rank = tf.get_static_value(target_rank)
+    if rank is not None and static_target_rank is not None:
+        num_dims = max(int(static_target_rank) - rank, 0)
+        if not -(rank+1) <= axis <= rank:
+            raise ValueError("`axis` is out of range `[-(D+1), D]`)")
+        axis = axis if axis>=0 else rank+axis+1
+        for _ in range(num_dims):
+            tensor = tf.expand_dims(tensor, axis)
+        return tensor
+
     num_dims = tf.maximum(target_rank - tf.rank(tensor), 0)
     output = insert_dims(tensor, num_dims, axis)
     return output
@@ -6,7 +6,8 @@ import unittest
 import numpy as np
 import tensorflow as tf
 from sionna.phy.channel import exp_corr_mat, one_ring_corr_mat, \
-    cir_to_time_channel, time_to_ofdm_channel, ApplyTimeChannel
+    cir_to_time_channel, time_to_ofdm_channel, ApplyTimeChannel, \
+    cir_to_ofdm_channel, subcarrier_frequencies
 from sionna.phy.channel.tr38901 import TDL
 from sionna.phy.ofdm import ResourceGrid, ResourceGridMapper, OFDMModulator, OFDMDemodulator, LSChannelEstimator
 from sionna.phy.mimo import StreamManagement
@@ -130,3 +131,30 @@ class TestTimeToOFDMChannel(unittest.TestCase):
             for l_min in range(l_max-cyclic_prefix_length, 1):
                 self.assertTrue(run_time_to_ofdm_channel_test(l_min, l_max, cyclic_prefix_length))
 
+
+class TestCIRToOFDMChannel(unittest.TestCase):
+    def test_numpy_reference(self):
+        """Test the channel frequency response against a NumPy reference
+           for both supported shapes of the path delays
+        """
+        batch_size, num_rx, num_rx_ant, num_tx, num_tx_ant = 3, 2, 4, 2, 3
+        num_paths, num_time_steps, fft_size = 5, 7, 48
+        frequencies = subcarrier_frequencies(fft_size, 30e3, "double")
+        shape = [batch_size, num_rx, num_rx_ant, num_tx, num_tx_ant,
+                 num_paths, num_time_steps]
+        a = config.np_rng.normal(size=shape) \
+            + 1j*config.np_rng.normal(size=shape)
+        for tau_shape in [[batch_size, num_rx, num_tx, num_paths],
+                          [batch_size, num_rx, num_rx_ant, num_tx, num_tx_ant,
+                           num_paths]]:
+            tau = config.np_rng.uniform(0, 1e-6, tau_shape)
+            h_f = cir_to_ofdm_channel(frequencies, a, tau)
+
+            # NumPy reference
+            tau_ref = tau
+            if len(tau_shape)==4:
+                tau_ref = tau_ref[:,:,np.newaxis,:,np.newaxis]
+            e = np.exp(-2j*np.pi*frequencies.numpy()*tau_ref[...,np.newaxis])
+            h_f_ref = np.sum(a[...,np.newaxis]*e[...,np.newaxis,:], axis=-3)
+            self.assertEqual(h_f.shape, h_f_ref.shape)
+            self.assertTrue(np.allclose(h_f, h_f_ref))
@@ -205,6 +205,30 @@ class TestDMCs(unittest.TestCase):
                 self.assertTrue(np.all((ber0 - pb[0]) < 0.01))
                 self.assertTrue(np.all((ber1 - pb[1]) < 0.01))
 
+    def test_non_binary_inputs(self):
+        "Test that non-binary / non-bipolar inputs raise an error"
+        for is_binary, x in ((True, [0., 1., 0.5]), (True, [0., 1., -1.]),
+                             (False, [-1., 1., 0.]), (False, [-1., 1., 2.])):
+            channel = BinarySymmetricChannel(bipolar_input=(not is_binary))
+            with self.assertRaises(tf.errors.InvalidArgumentError):
+                channel(tf.constant(x), 0.1)
+
+    def test_integer_inputs(self):
+        "Test that pb is not truncated for integer inputs of the BSC / Z"
+
+        bs = 100000
+        pb = 0.2
+        source = BinarySource()
+        for channel in (BinarySymmetricChannel(), BinaryZChannel()):
+            x = tf.cast(source((bs,)), tf.int32)
+            y = channel(x, pb)
+            self.assertTrue(y.dtype==tf.int32)
+
+            # error rate for x=1 (the Z channel only flips ones)
+            ber1 = tf.reduce_sum(tf.cast(x!=y, tf.float32)*tf.cast(x, tf.float32)) \
+                / tf.reduce_sum(tf.cast(x, tf.float32))
+            self.assertTrue(np.abs(ber1 - pb) < 0.01)
+
 class TestBEC(unittest.TestCase):
     """Tests for Binary Erasure Channel."""
 
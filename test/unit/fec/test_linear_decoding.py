@@ -64,12 +64,12 @@ class TestOSD(unittest.TestCase):
         # very large LLRs (decoder clips internally at 1000)
         llr_ch = 1000. * (2*c-1)
         c_hat = dec(llr_ch)
-        self.assertTrue(np.array_equal(c_hat.numpy(), c.numpy()))
+        self.assertTrue(tf.reduce_all(tf.equal(c_hat, c)))
 
         # very small LLRs (but still correct)
         llr_ch = 0.0001 * (2*c-1)
         c_hat = dec(llr_ch)
-        self.assertTrue(np.array_equal(c_hat.numpy(), c.numpy()))
+        self.assertTrue(tf.reduce_all(tf.equal(c_hat, c)))
 
     def test_error_patterns(self):
         """test that _num_error_patterns() returns correct values."""
@@ -115,9 +115,10 @@ class TestOSD(unittest.TestCase):
         shape = [100, n]
         source = GaussianPriorSource()
 
-        for dt_in in dt:
-            for prec, d_out in zip(precisions, dt):
-                dec = OSDecoder(gm, precision=prec)
+        for prec, d_out in zip(precisions, dt):
+            # the decoder is only initialized once per precision
+            dec = OSDecoder(gm, precision=prec)
+            for dt_in in dt:
                 # variable input dtype
                 llr_ch = tf.cast(source(shape, 0.1), dt_in)
                 c = dec(llr_ch)
@@ -193,7 +194,7 @@ class TestOSD(unittest.TestCase):
             c_ref = dec(llr_ref) # encode as 2-D array
             s[-1] = n
             c_ref = tf.reshape(c_ref, s)
-            self.assertTrue(np.array_equal(c.numpy(), c_ref.numpy()))
+            self.assertTrue(tf.reduce_all(tf.equal(c, c_ref)))
 
     @pytest.mark.usefixtures("only_gpu")
     def test_reference(self):
@@ -5,7 +5,7 @@
 import unittest
 import numpy as np
 import tensorflow as tf
-from sionna.phy.fec.polar.utils import generate_5g_ranking, generate_rm_code, generate_dense_polar
+from sionna.phy.fec.polar.utils import generate_5g_ranking, generate_rm_code, generate_dense_polar, generate_polar_transform_mat
 from sionna.phy.fec.polar import PolarEncoder
 from sionna.phy.mapping import BinarySource
 
@@ -53,6 +53,17 @@ class TestPolarUtils(unittest.TestCase):
             self.assertEqual(len(frozen_pos), n-k)
             self.assertEqual(len(info_pos), k)
 
+    def test_polar_transform_mat(self):
+        """Test polar transform against the bitwise definition of the
+        lifted kernel, i.e., G[i,j]=1 iff j is a binary submask of i."""
+        for n_lift in range(1, 11):
+            n = 2**n_lift
+            gm = generate_polar_transform_mat(n_lift)
+            i = np.arange(n)[:,None]
+            j = np.arange(n)[None,:]
+            gm_ref = (np.bitwise_and(j, np.invert(i))==0).astype(float)
+            self.assertTrue(np.array_equal(gm, gm_ref))
+
     def test_generate_dense_polar(self):
         """test naive (dense) polar code construction method."""
 
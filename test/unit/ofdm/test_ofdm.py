@@ -81,6 +81,24 @@ class TestOFDMModulator(unittest.TestCase):
             self.assertTrue(check)
             start = end
 
+    def test_numpy_reference(self):
+        "Test modulator output against a NumPy reference"
+        batch_size = [16, 3]
+        num_ofdm_symbols = 14
+        qam_source = QAMSource(4)
+        for precision in ["single", "double"]:
+            for fft_size in [72, 75]:
+                modulator = OFDMModulator(0, precision=precision)
+                x = qam_source(batch_size + [num_ofdm_symbols, fft_size])
+                x_time = modulator(x)
+                self.assertEqual(x_time.dtype, modulator.cdtype)
+
+                # NumPy reference
+                x_ref = np.fft.ifftshift(x.numpy(), axes=-1)
+                x_ref = np.fft.ifft(x_ref, norm="ortho")
+                x_ref = np.reshape(x_ref, batch_size + [-1])
+                self.assertLess(np.max(np.abs(x_ref-x_time)), 1e-5)
+
 class TestOFDMDemodulator(unittest.TestCase):
     def test_cyclic_prefixes(self):
         batch_size = 64
@@ -122,6 +140,82 @@ class TestOFDMDemodulator(unittest.TestCase):
             x_hat = demodulator(x_time)
             self.assertLess(np.max(np.abs(x-x_hat)), 1e-5)
 
+    def test_variable_cyclic_prefixes(self):
+        "Test per-OFDM symbol cyclic prefix length, including identical lengths"
+        batch_size = [16, 3]
+        fft_size = 72
+        num_ofdm_symbols = 14
+        qam_source = QAMSource(4)
+        for cp_lengths in [np.arange(num_ofdm_symbols),
+                           np.full([num_ofdm_symbols], 6)]:
+            modulator = OFDMModulator(cp_lengths)
+            demodulator = OFDMDemodulator(fft_size, 0, cp_lengths)
+            x = qam_source(batch_size + [num_ofdm_symbols, fft_size])
+            x_time = modulator(x)
+            # Additional samples must be discarded
+            x_time = tf.concat([x_time, x_time[...,:fft_size+10]], axis=-1)
+            x_hat = demodulator(x_time)
+            self.assertEqual(x_hat.shape, x.shape)
+            self.assertLess(np.max(np.abs(x-x_hat)), 1e-5)
+
+    def test_phase_compensation(self):
+        "Test phase compensation and DC shift against a NumPy reference"
+        batch_size = [16, 3]
+        num_ofdm_symbols = 14
+        cp_length = 6
+        for precision in ["single", "double"]:
+            for fft_size in [72, 75]:
+                for l_min in [0, -1, -6]:
+                    demodulator = OFDMDemodulator(fft_size, l_min, cp_length,
+                                                  precision=precision)
+                    shape = batch_size + [num_ofdm_symbols*(fft_size+cp_length)]
+                    x_time = tf.complex(tf.random.normal(shape),
+                                        tf.random.normal(shape))
+                    x_hat = demodulator(x_time)
+                    self.assertEqual(x_hat.dtype, demodulator.cdtype)
+
+                    # NumPy reference
+                    x = np.reshape(x_time.numpy(),
+                                   batch_size + [num_ofdm_symbols, fft_size+cp_length])
+                    x = np.fft.fft(x[...,cp_length:], norm="ortho")
+                    x *= np.exp(-2j*np.pi*l_min/fft_size*np.arange(fft_size))
+                    x = np.fft.fftshift(x, axes=-1)
+                    self.assertLess(np.max(np.abs(x-x_hat)), 1e-4)
+
+    def test_real_valued_input(self):
+        "Test that real-valued inputs are demodulated like complex ones"
+        batch_size = [16, 3]
+        num_ofdm_symbols = 14
+        cp_length = 6
+        for precision in ["single", "double"]:
+            for fft_size in [72, 75]:
+                for l_min in [0, -3]:
+                    demodulator = OFDMDemodulator(fft_size, l_min, cp_length,
+                                                  precision=precision)
+                    shape = batch_size + [num_ofdm_symbols*(fft_size+cp_length)]
+                    x_time = tf.random.normal(shape)
+                    x_hat = demodulator(x_time)
+                    self.assertEqual(x_hat.dtype, demodulator.cdtype)
+                    x_hat_ref = demodulator(tf.complex(x_time, 0.))
+                    self.assertLess(np.max(np.abs(x_hat-x_hat_ref)), 1e-5)
+
+    def test_graph_mode_jit(self):
+        "Test that XLA-compiled and eager demodulation are identical"
+        batch_size = [16, 3]
+        fft_size = 72
+        num_ofdm_symbols = 14
+        for cp_length in [6, np.arange(num_ofdm_symbols)]:
+            demodulator = OFDMDemodulator(fft_size, -4, cp_length)
+            num_samples = num_ofdm_symbols*fft_size \
+                          + np.sum(np.broadcast_to(cp_length, [num_ofdm_symbols]))
+            shape = batch_size + [num_samples + 5]
+            x_time = tf.complex(tf.random.normal(shape),
+                                tf.random.normal(shape))
+            x_hat = demodulator(x_time)
+            x_hat_xla = tf.function(demodulator, jit_compile=True)(x_time)
+            self.assertEqual(x_hat_xla.shape, batch_size + [num_ofdm_symbols, fft_size])
+            self.assertLess(np.max(np.abs(x_hat-x_hat_xla)), 1e-5)
+
 class TestOFDMModDemod(unittest.TestCase):
     def test_end_to_end(self):
         """E2E test verying that all shapes can be properly inferred (see Issue #7)"""
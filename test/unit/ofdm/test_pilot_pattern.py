@@ -4,6 +4,7 @@
 
 import unittest
 import numpy as np
+import tensorflow as tf
 from sionna.phy.ofdm import PilotPattern, EmptyPilotPattern
 
 class TestPilotPattern(unittest.TestCase):
@@ -72,6 +73,27 @@ class TestPilotPattern(unittest.TestCase):
         pp = PilotPattern(mask, pilots, normalize=True)
         self.assertTrue(np.allclose(np.mean(np.abs(pp.pilots)**2, -1), 1.0))
 
+    def test_normalized_pilots_update(self):
+        """Normalized pilots are updated when pilots or normalize change,
+        also if they are first accessed in graph mode"""
+        mask = np.zeros([1,2,14,64], bool)
+        mask[0,0,0,:] = True
+        mask[0,1,1,:] = True
+        num_pilots = np.max(np.sum(mask, (-2,-1)))
+        pilots = 3*np.ones([1,2,num_pilots], np.complex64)
+        pp = PilotPattern(mask, pilots, normalize=True)
+
+        @tf.function
+        def get_pilots():
+            return pp.pilots
+        self.assertTrue(np.allclose(get_pilots(), 1.0))
+        self.assertTrue(np.allclose(pp.pilots, 1.0))
+
+        pp.pilots = 2*np.ones([1,2,num_pilots], np.complex64)
+        self.assertTrue(np.allclose(pp.pilots, 1.0))
+        pp.normalize = False
+        self.assertTrue(np.allclose(pp.pilots, 2.0))
+
 class TestEmptyPilotPattern(unittest.TestCase):
     """Unittest for the EmptyPilotPattern Class"""
 
@@ -104,6 +104,39 @@ class TestFlattenDims(unittest.TestCase):
                     new_shape = shape[:axis] + [np.prod(shape[axis:axis+num_dims])] + shape[axis+num_dims:]
                     self.assertEqual(r.shape, new_shape)
 
+class TestExpandToRank(unittest.TestCase):
+    """Unittest for the expand_to_rank function"""
+    def test_shapes(self):
+        """Static and dynamic ranks result in the same shapes"""
+        x = tf.zeros([2, 3])
+        for axis, target_shape in ((0, [1, 1, 2, 3]),
+                                   (1, [2, 1, 1, 3]),
+                                   (-1, [2, 3, 1, 1]),
+                                   (-2, [2, 1, 1, 3])):
+            # static rank
+            self.assertEqual(expand_to_rank(x, 4, axis).shape, target_shape)
+            self.assertEqual(expand_to_rank(x, tf.rank(tf.zeros([1]*4)),
+                                            axis).shape, target_shape)
+            # dynamic rank of the tensor
+            @tf.function(input_signature=[tf.TensorSpec(None, tf.float32)])
+            def f(x):
+                return tf.shape(expand_to_rank(x, 4, axis))
+            self.assertEqual(f(x).numpy().tolist(), target_shape)
+
+        # target rank smaller than rank of the tensor
+        self.assertEqual(expand_to_rank(x, 1, 0).shape, [2, 3])
+
+    def test_static_shape_in_graph(self):
+        """Known dimensions are preserved in graph mode"""
+        @tf.function(input_signature=[tf.TensorSpec([None, 3], tf.float32),
+                                      tf.TensorSpec([None, 4, 5, 3],
+                                                    tf.float32)])
+        def f(x, y):
+            z = expand_to_rank(x, tf.rank(y), 1)
+            self.assertEqual(z.shape.as_list(), [None, 1, 1, 3])
+            return z
+        f(tf.zeros([2, 3]), tf.zeros([2, 4, 5, 3]))
+
 class TestMatrixPinv(unittest.TestCase):
     """Unittest for the matrix_pinv function"""
     def test_single_dim(self):